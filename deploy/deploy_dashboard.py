@@ -17,11 +17,87 @@ Requirements:
 """
 
 import argparse
-import io
+import atexit
+import contextlib
+import functools
+import hashlib
+import mmap
+import shlex
+import shutil
+import socket
+import subprocess
+import threading
+from collections import namedtuple
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import paramiko
+
+# paramiko (and the cryptography stack behind it) is imported where it's
+# first needed, so --help and argument errors don't pay its import time
+
+
+# One file to deploy: in-memory content if set, else local_file is streamed.
+# size is the byte count (from the caller's stat) used in status messages.
+Upload = namedtuple("Upload", ["label", "remote_path", "local_file", "content", "size"])
+
+
+class _SSHPool:
+    """Process-wide cache of live SSH clients, keyed by connection parameters"""
+
+    _cache = {}
+
+    @classmethod
+    def get(cls, key, factory):
+        """
+        Return a live client for key, creating one with factory() if needed.
+
+        Returns:
+            (client, reused) tuple
+        """
+        client = cls._cache.get(key)
+        if client is not None:
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                return client, True
+            client.close()
+        client = factory()
+        cls._cache[key] = client
+        return client, False
+
+    @classmethod
+    def close_all(cls):
+        """Close every pooled connection"""
+        for client in cls._cache.values():
+            client.close()
+        cls._cache.clear()
+
+
+atexit.register(_SSHPool.close_all)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_key(path, mtime_ns):
+    """
+    Load a private key file of any supported type (Ed25519, ECDSA or RSA).
+
+    Parsed keys are cached per (path, mtime_ns), so repeated connects skip
+    re-parsing; pass the file's current st_mtime_ns so an edited key reloads.
+    """
+    import paramiko
+
+    if hasattr(paramiko.PKey, "from_path"):  # paramiko 3.2+
+        return paramiko.PKey.from_path(path)
+    error = None
+    for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey):
+        try:
+            return key_class.from_private_key_file(path)
+        except paramiko.PasswordRequiredException:
+            raise
+        except (paramiko.SSHException, TypeError, ValueError) as e:
+            error = e
+    raise error
+
 
 class HomeAssistantDeployer:
     """Handles deployment to Home Assistant server via SSH"""
@@ -35,8 +111,62 @@ class HomeAssistantDeployer:
     # Theme names (must match top-level key in theme YAML files)
     PROD_THEME_NAME = "My Dashboard Theme"
     STAGING_THEME_NAME = "My Dashboard Theme - Staging"
+    PROD_THEME_NAME_B = PROD_THEME_NAME.encode("utf-8")
+    STAGING_THEME_NAME_B = STAGING_THEME_NAME.encode("utf-8")
+
+    # HA services called (in order) via the REST API after a deploy
+    RELOAD_SERVICES = [
+        "homeassistant/reload_core_config",
+        "frontend/reload_themes",
+        "browser_mod/refresh",
+    ]
+
+    # CLI reload fallbacks for HA OS, venv and Docker installs, as
+    # (availability probe, reload command) pairs
+    RELOAD_CLI_COMMANDS = [
+        ("command -v hassio >/dev/null 2>&1",
+         "hassio homeassistant reload core_config"),
+        ("[ -x /srv/homeassistant/bin/homeassistant ]",
+         "sudo -u homeassistant -H /srv/homeassistant/bin/homeassistant --script reload_core_config"),
+        ("command -v docker >/dev/null 2>&1",
+         "docker exec homeassistant homeassistant --script reload_core_config"),
+    ]
+
+    # One POSIX shell probes for the first available CLI and runs only that
+    # one, echoing its index so the caller can report which was used; exits
+    # 127 if none is installed. Wrapped in sh -c so the login shell doesn't matter.
+    RELOAD_CLI_NOT_FOUND = 127
+    RELOAD_CLI_SCRIPT = "sh -c " + shlex.quote("; el".join(
+        f"if {probe}; then echo {i}; {cmd} >/dev/null"
+        for i, (probe, cmd) in enumerate(RELOAD_CLI_COMMANDS)
+    ) + f"; else exit {RELOAD_CLI_NOT_FOUND}; fi")
+
+    # SFTP channel tuning (used unless sftp_window is 0): max incoming packet
+    # size, and payload per SFTP WRITE request (OpenSSH accepts up to 256 KiB)
+    SFTP_MAX_PACKET_SIZE = 128 * 1024
+    SFTP_WRITE_SIZE = 128 * 1024
+
+    # Uploads at least this large are split into byte ranges written over
+    # separate SFTP channels at once, since one SFTP stream can't fill a
+    # high-latency link on its own
+    PARALLEL_UPLOAD_MIN = 8 * 1024 * 1024
+    PARALLEL_UPLOAD_STREAMS = 4
+
+    # SFTP uploads at least this large report progress, in PROGRESS_STEPS
+    # steps; data is handed to paramiko in PROGRESS_BLOCK pieces to count it
+    PROGRESS_MIN = 1024 * 1024
+    PROGRESS_STEPS = 4
+    PROGRESS_BLOCK = 256 * 1024
+
+    # Private (0700) directory for the scp fast path's control sockets, so
+    # repeated scp runs share one OpenSSH master connection. Kept out of the
+    # shared temp dir, where another user could plant a fake master socket;
+    # %C (a hash of host, port and user) names the socket inside it.
+    SCP_CONTROL_DIR = os.path.join(os.path.expanduser("~"), ".ssh", "ha-deploy")
     
-    def __init__(self, host, username, key_file=None, password=None, port=22, token=None):
+    def __init__(self, host, username, key_file=None, password=None, port=22, token=None,
+                 use_pool=True, compress=True, skip_unchanged=True,
+                 sftp_window=4 * 1024 * 1024, tcp_buffer=0, use_scp=True, insecure=False):
         """
         Initialize the deployer
 
@@ -44,9 +174,20 @@ class HomeAssistantDeployer:
             host: SSH hostname or IP address
             username: SSH username
             key_file: Path to SSH private key file (optional)
-            password: SSH password (alternative to key_file)
+            password: SSH password (alternative to key_file; with neither, ssh-agent
+                and default ~/.ssh keys are tried)
             port: SSH port (default: 22)
             token: Home Assistant Long-Lived Access Token (optional, for API reload)
+            use_pool: Reuse a live pooled SSH connection to the same server (default: True)
+            compress: Negotiate zlib compression on the SSH transport (default: True)
+            skip_unchanged: Skip uploads whose remote file is already identical (default: True)
+            sftp_window: SFTP channel window size in bytes (default: 4 MiB; 0 = paramiko defaults)
+            tcp_buffer: TCP send/receive buffer size in bytes (default: 0 = kernel autotuning)
+            use_scp: Upload local files with the system scp binary when available,
+                falling back to SFTP (default: True; not used with password, since
+                scp runs in batch mode)
+            insecure: Accept unknown server host keys instead of requiring a
+                known_hosts entry (default: False)
         """
         self.host = host
         self.username = username
@@ -54,47 +195,390 @@ class HomeAssistantDeployer:
         self.password = password
         self.port = port
         self.token = token
+        self.use_pool = use_pool
+        self.compress = compress
+        self.skip_unchanged = skip_unchanged
+        self.sftp_window = sftp_window
+        self.tcp_buffer = tcp_buffer
+        self.insecure = insecure
         self.ssh_client = None
+        self.transport = None
         self.sftp_client = None
-        
+        self._owns = True
+        self._scp = shutil.which("scp") if use_scp and not password else None
+        self._reload_cmd = self._api_command(self.RELOAD_SERVICES) if token else None
+
+    def _open_socket(self):
+        """
+        Connect a TCP socket to the server, tuned before the handshake.
+
+        TCP_NODELAY stops Nagle from holding back small SFTP/exec request
+        packets. Buffer sizes are only set when tcp_buffer is given, since on
+        Linux setting them disables the kernel's own autotuning.
+        """
+        error = OSError(f"Could not resolve {self.host}")
+        for family, socktype, proto, _, addr in socket.getaddrinfo(
+                self.host, self.port, socket.AF_UNSPEC, socket.SOCK_STREAM):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.tcp_buffer:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.tcp_buffer)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.tcp_buffer)
+                sock.connect(addr)
+                return sock
+            except OSError as e:
+                sock.close()
+                error = e
+        raise error
+
+    def _new_client(self):
+        """Open a new authenticated SSH client"""
+        import paramiko
+
+        client = paramiko.SSHClient()
+        # Verify the server against ~/.ssh/known_hosts (read-only, never
+        # rewritten); unknown hosts are rejected unless insecure is set
+        client.load_system_host_keys()
+        if self.insecure:
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        # A loadable key or a password is the only thing offered, so auth
+        # doesn't first spend round-trips on agent and ~/.ssh/id_* keys
+        if self.key_file:
+            try:
+                pkey = _load_key(self.key_file, os.stat(self.key_file).st_mtime_ns)
+            except (paramiko.SSHException, TypeError, ValueError):
+                # Passphrase-protected (or a format we can't parse): hand
+                # paramiko the file and let it fall back to ssh-agent keys,
+                # where the unlocked key usually lives
+                auth = {"key_filename": self.key_file, "allow_agent": True, "look_for_keys": False}
+            else:
+                auth = {"pkey": pkey, "allow_agent": False, "look_for_keys": False}
+                if not isinstance(pkey, paramiko.RSAKey):
+                    # Nothing to sign with SHA-1 ssh-rsa, so don't negotiate it
+                    auth["disabled_algorithms"] = {"pubkeys": ["ssh-rsa"]}
+        elif self.password:
+            auth = {"password": self.password, "allow_agent": False, "look_for_keys": False}
+        else:
+            # paramiko's defaults: ssh-agent keys, then ~/.ssh/id_*
+            auth = {}
+
+        client.connect(
+            hostname=self.host,
+            username=self.username,
+            port=self.port,
+            compress=self.compress,
+            sock=self._open_socket(),
+            **auth
+        )
+
+        if self.sftp_window:
+            # Every channel opened later (SFTP and exec) inherits these
+            transport = client.get_transport()
+            transport.default_window_size = self.sftp_window
+            transport.default_max_packet_size = self.SFTP_MAX_PACKET_SIZE
+        return client
+
     def connect(self):
-        """Establish SSH connection"""
+        """Establish SSH connection (reusing a pooled one when available)"""
         try:
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            if self.key_file:
-                self.ssh_client.connect(
-                    hostname=self.host,
-                    username=self.username,
-                    key_filename=self.key_file,
-                    port=self.port
-                )
+            reused = False
+            if self.use_pool:
+                key = (self.host, self.username, self.port, self.key_file,
+                       self.compress, self.sftp_window, self.tcp_buffer, self.insecure)
+                self.ssh_client, reused = _SSHPool.get(key, self._new_client)
+                self._owns = False
             else:
-                self.ssh_client.connect(
-                    hostname=self.host,
-                    username=self.username,
-                    password=self.password,
-                    port=self.port
-                )
-            
-            self.sftp_client = self.ssh_client.open_sftp()
-            print(f"✓ Connected to {self.host}")
+                self.ssh_client = self._new_client()
+                self._owns = True
+
+            # Every channel (SFTP and exec) is multiplexed on this one transport
+            self.transport = self.ssh_client.get_transport()
+            self.sftp_client = self._open_sftp()
+            print(f"✓ Connected to {self.host}" + (" (reused connection)" if reused else ""))
             return True
             
         except Exception as e:
             print(f"✗ Connection failed: {e}")
+            if "known_hosts" in str(e):
+                print(f"  Connect once with 'ssh -p {self.port} {self.username}@{self.host}' to add "
+                      f"its host key, or pass --insecure to skip the check")
             return False
     
     def disconnect(self):
-        """Close SSH connection"""
+        """Close SSH connection (pooled connections stay open until process exit)"""
         if self.sftp_client:
             self.sftp_client.close()
+            self.sftp_client = None
+        if not self._owns:
+            return
         if self.ssh_client:
             self.ssh_client.close()
         print("✓ Disconnected from server")
     
-    def deploy_file(self, local_file, remote_path, label="file"):
+    def _open_sftp(self):
+        """Open an SFTP channel on the existing SSH transport (window set in _new_client)"""
+        import paramiko
+
+        return paramiko.SFTPClient.from_transport(self.transport)
+
+    def _exec(self, command, timeout=30):
+        """
+        Run a command on a new session channel of the shared transport.
+
+        Returns:
+            (exit_status, stdout, stderr) tuple with decoded output
+        """
+        channel = self.transport.open_session()
+        try:
+            channel.settimeout(timeout)
+            channel.exec_command(command)
+            out = channel.makefile("rb").read().decode()
+            err = channel.makefile_stderr("rb").read().decode()
+            return channel.recv_exit_status(), out, err
+        finally:
+            channel.close()
+
+    @contextlib.contextmanager
+    def _map_local(self, local_file):
+        """
+        Map a local file read-only and yield a memoryview of its contents.
+
+        Hashing and uploading both read from the mapping, so the file is read
+        from disk once (into the page cache) and never copied into Python memory.
+        """
+        with open(local_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")  # empty files can't be mapped
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+                try:
+                    mapped.close()
+                except BufferError:
+                    # Slices are still referenced (e.g. from an exception's
+                    # traceback); the mapping is freed once they're collected
+                    pass
+
+    def _open_remote(self, sftp, remote_path, mode):
+        """Open a remote file for pipelined SFTP WRITE requests"""
+        remote_file = sftp.open(remote_path, mode)
+        remote_file.set_pipelined(True)
+        if self.sftp_window:
+            remote_file.MAX_REQUEST_SIZE = self.SFTP_WRITE_SIZE
+        return remote_file
+
+    def _write_blocks(self, remote_file, data, progress=None):
+        """Queue data on remote_file, calling progress(n_bytes) as it goes (if given)"""
+        if progress is None:
+            remote_file.write(data)
+            return
+        for offset in range(0, len(data), self.PROGRESS_BLOCK):
+            block = data[offset:offset + self.PROGRESS_BLOCK]
+            remote_file.write(block)
+            progress(len(block))
+
+    def _progress(self, label, total):
+        """Return a thread-safe progress(n_bytes) callback printing each 1/PROGRESS_STEPS of total"""
+        lock = threading.Lock()
+        sent = shown = 0
+
+        def progress(n_bytes):
+            nonlocal sent, shown
+            with lock:
+                sent += n_bytes
+                step = sent * self.PROGRESS_STEPS // total
+                if step > shown:
+                    shown = step
+                    print(f"  {label}: {sent * 100 // total}% ({sent:,} / {total:,} bytes)")
+        return progress
+
+    def _sftp_write(self, sftp, remote_path, data, progress=None):
+        """Write data to remote_path using pipelined SFTP WRITE requests"""
+        # A memoryview lets paramiko slice off each WRITE request without
+        # copying the rest of the data (older releases slice the bytes
+        # object directly)
+        data = memoryview(data)
+        if len(data) >= self.PARALLEL_UPLOAD_MIN:
+            self._sftp_write_parallel(sftp, remote_path, data, progress)
+        else:
+            with self._open_remote(sftp, remote_path, "wb") as remote_file:
+                self._write_blocks(remote_file, data, progress)
+
+    def _confirm_upload(self, sftp, remote_path, data, digest=None):
+        """
+        Raise IOError unless remote_path holds exactly data (digest: its SHA-256, if known).
+
+        paramiko never checks the replies to pipelined WRITEs, so a failed one
+        (disk full, quota) leaves either a short file or, when later WRITEs
+        succeed, a zero-filled hole of the full length. The remote sha256sum
+        catches both in one round-trip; if the server won't run commands,
+        only the size can be checked.
+        """
+        import paramiko
+
+        try:
+            # Read from stdin so the path can't change sha256sum's output format
+            exit_status, out, _ = self._exec(f"sha256sum < {shlex.quote(remote_path)}")
+        except (paramiko.SSHException, OSError):
+            exit_status = None
+        if exit_status == 0:
+            if out.split(" ", 1)[0] != (digest or hashlib.sha256(data).hexdigest()):
+                raise IOError(f"{remote_path} does not match the local data after upload "
+                              f"(disk full or quota exceeded?)")
+            return
+        size = sftp.stat(remote_path).st_size
+        if size != len(data):
+            raise IOError(f"{remote_path} is {size:,} bytes after upload, expected {len(data):,} "
+                          f"(disk full or quota exceeded?)")
+
+    def _sftp_write_parallel(self, sftp, remote_path, data, progress=None):
+        """
+        Write data to remote_path as byte ranges over several SFTP channels.
+
+        Each range is written at its own offset into the same file through a
+        separate SFTP channel on the shared transport, so no reassembly is
+        needed on the server.
+        """
+        step = -(-len(data) // self.PARALLEL_UPLOAD_STREAMS)
+        offsets = range(0, len(data), step)
+
+        # Create (or truncate) the file so every range can open it in place
+        sftp.open(remote_path, "wb").close()
+
+        def run(offset, channel):
+            with self._open_remote(channel, remote_path, "r+b") as remote_file:
+                remote_file.seek(offset)
+                self._write_blocks(remote_file, data[offset:offset + step], progress)
+
+        channels = []
+        try:
+            channels += [self._open_sftp() for _ in offsets]
+            with ThreadPoolExecutor(max_workers=len(channels)) as pool:
+                futures = [pool.submit(run, offset, channel)
+                           for offset, channel in zip(offsets, channels)]
+                for future in futures:
+                    future.result()
+        finally:
+            for channel in channels:
+                channel.close()
+
+    def _fast_upload(self, local_file, remote_path):
+        """
+        Upload a local file with the system scp binary.
+
+        OpenSSH's C implementation is much faster than paramiko's SFTP on
+        slow links. Runs in batch mode (-B), so it never prompts; any failure
+        (key not usable in batch mode, unknown host key, ...) disables scp for
+        the rest of the run and the caller falls back to SFTP.
+
+        Returns:
+            True if the upload succeeded
+        """
+        # Legacy scp passes the remote path through the remote shell,
+        # so leave anything that would need quoting to SFTP
+        if not self._scp or shlex.quote(remote_path) != remote_path:
+            return False
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        # Only a slow connect is cut short; the transfer itself may take as long as it needs
+        command = [self._scp, "-B", "-q", "-P", str(self.port), "-o", "ConnectTimeout=15"]
+        if self._scp_control_dir():
+            command += [
+                "-o", "ControlMaster=auto",
+                "-o", f"ControlPath={os.path.join(self.SCP_CONTROL_DIR, '%C')}",
+                "-o", "ControlPersist=300",
+            ]
+        if self.key_file:
+            command += ["-i", self.key_file]
+        if self.compress:
+            command.append("-C")
+        command += [str(local_file), f"{self.username}@{host}:{remote_path}"]
+        try:
+            result = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, universal_newlines=True)
+            if result.returncode == 0:
+                return True
+            error = result.stderr.strip() or f"exit {result.returncode}"
+        except OSError as e:
+            error = e
+        print(f"⚠ scp upload failed ({error}), falling back to SFTP")
+        self._scp = None
+        return False
+
+    def _scp_control_dir(self):
+        """
+        Create SCP_CONTROL_DIR if needed and return True if it is safe to use.
+
+        OpenSSH requires that no other user can write to the control socket's
+        directory. Windows OpenSSH has no connection multiplexing at all.
+        """
+        if os.name == "nt":
+            return False
+        try:
+            os.makedirs(self.SCP_CONTROL_DIR, mode=0o700, exist_ok=True)
+            st = os.stat(self.SCP_CONTROL_DIR)
+        except OSError:
+            return False
+        return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+    def _write_remote(self, sftp, remote_path, write, data, backup=False, digest=None):
+        """
+        Upload data to remote_path via write(tmp_path), then move it into place.
+
+        The data is written to a temporary file next to remote_path and renamed
+        over it once complete, so readers never see a partial upload. Before it
+        replaces anything, the temporary file's SHA-256 must equal digest (or
+        data's); on servers that won't run sha256sum only its size is checked.
+        With backup, the existing file is renamed to <remote_path>.backup (a
+        metadata-only move, no copy on the server) only once the upload has
+        been checked, right before the final rename, so the live path is
+        missing for at most one round-trip.
+
+        Returns:
+            Path of the backup created, or None
+        """
+        tmp_path = f"{remote_path}.tmp"
+        backup_path = None
+        try:
+            write(tmp_path)
+            self._confirm_upload(sftp, tmp_path, data, digest)
+            if backup:
+                backup_path = self._rename_backup(sftp, remote_path)
+            sftp.posix_rename(tmp_path, remote_path)
+        except Exception:
+            try:
+                if backup_path:
+                    sftp.posix_rename(backup_path, remote_path)
+                sftp.remove(tmp_path)
+            except IOError:
+                pass
+            raise
+        return backup_path
+
+    def _rename_backup(self, sftp, remote_path):
+        """
+        Move an existing remote file to <remote_path>.backup.
+
+        Returns:
+            The backup path, or None if there was nothing to back up
+        """
+        backup_path = f"{remote_path}.backup"
+        try:
+            sftp.posix_rename(remote_path, backup_path)
+            return backup_path
+        except FileNotFoundError:
+            return None
+        except IOError as e:
+            print(f"⚠ Backup warning: {e}")
+            return None
+
+    def deploy_file(self, local_file, remote_path, label="file", sftp=None, backup=False,
+                    *, size=None, data=None, digest=None):
         """
         Deploy a file to Home Assistant
 
@@ -102,13 +586,33 @@ class HomeAssistantDeployer:
             local_file: Path to local file
             remote_path: Path on remote server
             label: Display label for status messages (e.g. "dashboard", "theme")
+            sftp: SFTP client to upload with (default: the main SFTP channel)
+            backup: Keep the existing remote file as <remote_path>.backup
+            size: Local file size, if already known (shown in the status message, and
+                enables progress output for SFTP uploads of PROGRESS_MIN bytes or more)
+            data: The file's contents from _map_local(), if already mapped by the caller
+            digest: SHA-256 hex digest of data, if already computed by the caller
         """
         try:
-            if not os.path.exists(local_file):
-                raise FileNotFoundError(f"Local file not found: {local_file}")
+            size_note = f" ({size:,} bytes)" if size is not None else ""
+            print(f"Uploading {label}: {local_file} → {remote_path}{size_note}...")
+            sftp = sftp or self.sftp_client
+            progress = None
+            if size is not None and size >= self.PROGRESS_MIN:
+                progress = self._progress(label, size)
+
+            with contextlib.ExitStack() as stack:
+                # The mapping is also what the upload is checked against, scp or not
+                if data is None:
+                    data = stack.enter_context(self._map_local(local_file))
+
+                def write(tmp_path):
+                    if not self._fast_upload(local_file, tmp_path):
+                        self._sftp_write(sftp, tmp_path, data, progress)
 
-            print(f"Uploading {label}: {local_file} → {remote_path}...")
-            self.sftp_client.put(local_file, remote_path)
+                backup_path = self._write_remote(sftp, remote_path, write, data, backup, digest)
+            if backup_path:
+                print(f"✓ Backup created at {backup_path}")
             print(f"✓ {label.capitalize()} uploaded successfully")
 
             return True
@@ -117,25 +621,155 @@ class HomeAssistantDeployer:
             print(f"✗ {label.capitalize()} upload failed: {e}")
             return False
 
-    def deploy_content(self, content, remote_path, label="file"):
+    def deploy_content(self, content, remote_path, label="file", sftp=None, backup=False,
+                       *, digest=None):
         """
         Deploy in-memory content to Home Assistant (no local file needed).
 
         Args:
-            content: String content to upload
+            content: Content to upload (str is encoded as UTF-8, bytes sent as-is)
             remote_path: Path on remote server
             label: Display label for status messages
+            sftp: SFTP client to upload with (default: the main SFTP channel)
+            backup: Keep the existing remote file as <remote_path>.backup
+            digest: SHA-256 hex digest of content, if already computed by the caller
         """
         try:
             print(f"Uploading {label}: → {remote_path}...")
-            file_obj = io.BytesIO(content.encode("utf-8"))
-            self.sftp_client.putfo(file_obj, remote_path)
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            sftp = sftp or self.sftp_client
+            backup_path = self._write_remote(
+                sftp, remote_path,
+                lambda tmp_path: self._sftp_write(sftp, tmp_path, content), content, backup, digest
+            )
+            if backup_path:
+                print(f"✓ Backup created at {backup_path}")
             print(f"✓ {label.capitalize()} uploaded successfully")
             return True
         except Exception as e:
             print(f"✗ {label.capitalize()} upload failed: {e}")
             return False
 
+    def _local_digest(self, local_file=None, content=None):
+        """Return the SHA-256 hex digest of a local file or in-memory content"""
+        if content is not None:
+            return hashlib.sha256(content.encode("utf-8") if isinstance(content, str) else content).hexdigest()
+        with self._map_local(local_file) as data:
+            return hashlib.sha256(data).hexdigest()
+
+    def _remote_prep(self, remote_paths, digests=True):
+        """
+        Create the remote parent directories and checksum the existing files,
+        all in one round-trip.
+
+        Returns:
+            Dict of remote_path → SHA-256 hex digest (missing files are omitted;
+            empty if digests is False)
+        """
+        dirs = sorted({os.path.dirname(path) for path in remote_paths} - {""})
+        command = f"mkdir -p {' '.join(shlex.quote(d) for d in dirs)}" if dirs else "true"
+        if digests:
+            # Exit with mkdir's status; sha256sum's stderr is dropped, so err is mkdir's
+            quoted = " ".join(shlex.quote(path) for path in remote_paths)
+            command += f"; status=$?; sha256sum {quoted} 2>/dev/null; exit $status"
+        exit_status, out, err = self._exec(command)
+        if exit_status != 0:
+            print(f"⚠ Could not create remote directories (exit {exit_status}): {err.strip()}")
+        remote = {}
+        for line in out.splitlines():
+            digest, _, path = line.partition("  ")
+            remote[path] = digest
+        return remote
+
+    def _changed_uploads(self, uploads, remote, mapped, digests):
+        """
+        Drop uploads whose remote file (digests from _remote_prep()) already has
+        identical content. mapped holds local_file → _map_local() view; the
+        local digests are stored in digests (remote_path → hex digest) for
+        checking the uploads afterwards.
+        """
+        changed = []
+        for upload in uploads:
+            if upload.content is None and upload.local_file not in mapped:
+                changed.append(upload)  # unreadable: deploy_file() reports it
+                continue
+            local = upload.content if upload.content is not None else mapped[upload.local_file]
+            digest = digests[upload.remote_path] = self._local_digest(upload.local_file, local)
+            if remote.get(upload.remote_path) == digest:
+                print(f"= {upload.label.capitalize()} unchanged, skipping upload")
+            else:
+                changed.append(upload)
+        return changed
+
+    def deploy_all(self, uploads, backup=True):
+        """
+        Back up and upload several files concurrently over one SSH connection.
+
+        Each upload gets its own SFTP channel on the shared transport, so the
+        transfers overlap instead of waiting on each other's round-trips.
+
+        Args:
+            uploads: List of Upload tuples
+            backup: Keep existing remote files as <remote_path>.backup
+
+        Returns:
+            (uploaded, failed) tuple of label lists; files skipped as unchanged
+            are in neither
+        """
+        with contextlib.ExitStack() as stack:
+            # Map each local file once: the same view is hashed for the
+            # unchanged check and then uploaded
+            mapped = {}
+            for upload in uploads:
+                if upload.content is None:
+                    try:
+                        mapped[upload.local_file] = stack.enter_context(self._map_local(upload.local_file))
+                    except OSError:
+                        pass  # deploy_file() reports it
+
+            try:
+                remote = self._remote_prep([upload.remote_path for upload in uploads],
+                                           digests=self.skip_unchanged)
+            except Exception as e:
+                print(f"⚠ Could not prepare remote files: {e}")
+                remote = None
+            digests = {}
+            if self.skip_unchanged and remote is not None:
+                uploads = self._changed_uploads(uploads, remote, mapped, digests)
+                if not uploads:
+                    return [], []
+
+            channels = [self.sftp_client]
+            try:
+                try:
+                    for _ in uploads[1:]:
+                        channels.append(self._open_sftp())
+                except Exception as e:
+                    # e.g. sshd's MaxSessions, or the connection dropped after the prep
+                    print(f"✗ Could not open SFTP channels: {e}")
+                    return [], [upload.label for upload in uploads]
+
+                def run(upload, sftp):
+                    if upload.content is not None:
+                        return self.deploy_content(upload.content, upload.remote_path, upload.label,
+                                                   sftp, backup,
+                                                   digest=digests.get(upload.remote_path))
+                    return self.deploy_file(upload.local_file, upload.remote_path, upload.label,
+                                            sftp, backup, size=upload.size,
+                                            data=mapped.get(upload.local_file),
+                                            digest=digests.get(upload.remote_path))
+
+                with ThreadPoolExecutor(max_workers=len(uploads)) as pool:
+                    results = list(pool.map(run, uploads, channels))
+            finally:
+                for sftp in channels[1:]:
+                    sftp.close()
+
+        uploaded = [upload.label for upload, ok in zip(uploads, results) if ok]
+        failed = [upload.label for upload, ok in zip(uploads, results) if not ok]
+        return uploaded, failed
+
     def reload_yaml_config(self):
         """
         Reload YAML configuration in Home Assistant.
@@ -145,44 +779,43 @@ class HomeAssistantDeployer:
         try:
             print("Reloading Home Assistant YAML configuration...")
 
-            # Method 1: HA REST API (works with any install type if token provided)
+            # Method 1: HA REST API (works with any install type if token provided).
+            # Core reload, theme reload and Browser Mod refresh share one SSH
+            # channel; the last two only run once the core reload succeeded.
             if self.token:
-                curl_cmd = (
-                    f'curl -sf -X POST'
-                    f' -H "Authorization: Bearer {self.token}"'
-                    f' -H "Content-Type: application/json"'
-                    f' http://localhost:8123/api/services/homeassistant/reload_core_config'
-                )
                 try:
-                    stdin, stdout, stderr = self.ssh_client.exec_command(curl_cmd, timeout=30)
-                    exit_status = stdout.channel.recv_exit_status()
-                    if exit_status == 0:
+                    exit_status, codes, err = self._api_post(self._reload_cmd)
+                    core, themes, browser = (codes + [None] * 3)[:3]
+                    if core == 200:
                         print("✓ Configuration reloaded successfully via HA REST API")
-                        self._reload_themes()
-                        self._browser_refresh()
+                        if themes == 200:
+                            print("✓ Themes reloaded via HA REST API")
+                        else:
+                            print("⚠ Theme reload failed")
+                        if browser == 200:
+                            print("✓ Browser refresh triggered via Browser Mod")
+                        else:
+                            print("⚠ Browser Mod refresh skipped (not installed or unavailable)")
                         return True
                     else:
-                        err = stderr.read().decode().strip()
-                        print(f"⚠ API reload failed (exit {exit_status}): {err}")
+                        print(f"⚠ API reload failed (exit {exit_status}, HTTP {core}): {err}")
                 except Exception as e:
                     print(f"⚠ API reload failed: {e}")
 
             # Method 2: CLI fallbacks
-            commands = [
-                "hassio homeassistant reload core_config",
-                "sudo -u homeassistant -H /srv/homeassistant/bin/homeassistant --script reload_core_config",
-                "docker exec homeassistant homeassistant --script reload_core_config"
-            ]
-
-            for cmd in commands:
-                try:
-                    stdin, stdout, stderr = self.ssh_client.exec_command(cmd, timeout=30)
-                    exit_status = stdout.channel.recv_exit_status()
+            try:
+                exit_status, out, err = self._exec(self.RELOAD_CLI_SCRIPT, timeout=60)
+                out = out.strip()
+                if out.isdigit():
+                    cmd = self.RELOAD_CLI_COMMANDS[int(out)][1]
                     if exit_status == 0:
                         print(f"✓ Configuration reloaded successfully using: {cmd}")
                         return True
-                except Exception:
-                    continue
+                    print(f"⚠ Reload via '{cmd}' failed (exit {exit_status}): {err.strip()}")
+                elif exit_status == self.RELOAD_CLI_NOT_FOUND:
+                    print("⚠ No reload CLI (hassio, homeassistant, docker) found on the server")
+            except Exception:
+                pass
 
             print("⚠ Could not auto-reload configuration. You may need to reload manually:")
             print("  - Via UI: Settings → Server Controls → YAML Configuration Reloading")
@@ -192,69 +825,87 @@ class HomeAssistantDeployer:
             print(f"✗ Reload failed: {e}")
             return False
     
-    def _reload_themes(self):
-        """Reload themes via HA REST API."""
-        if not self.token:
-            return
-        curl_cmd = (
-            f'curl -sf -X POST'
-            f' -H "Authorization: Bearer {self.token}"'
-            f' -H "Content-Type: application/json"'
-            f' http://localhost:8123/api/services/frontend/reload_themes'
-        )
-        try:
-            stdin, stdout, stderr = self.ssh_client.exec_command(curl_cmd, timeout=10)
-            exit_status = stdout.channel.recv_exit_status()
-            if exit_status == 0:
-                print("✓ Themes reloaded via HA REST API")
-            else:
-                print("⚠ Theme reload failed")
-        except Exception:
-            pass
+    def _api_command(self, services):
+        """
+        Build a command that POSTs to several HA services in order.
 
-    def _browser_refresh(self):
-        """Refresh all connected browsers via Browser Mod (if installed)."""
-        if not self.token:
-            return
-        curl_cmd = (
-            f'curl -sf -X POST'
+        The first service gates the rest: they are only called if it returns
+        HTTP 200, but still from the same SSH channel, and curl's --next
+        reuses one keep-alive connection to HA for them. Wrapped in sh -c so
+        the login shell doesn't matter.
+
+        Args:
+            services: List of "domain/service" names
+        """
+        transfers = [
+            f'-s -o /dev/null -w "%{{http_code}}\\n" -X POST'
             f' -H "Authorization: Bearer {self.token}"'
             f' -H "Content-Type: application/json"'
-            f' http://localhost:8123/api/services/browser_mod/refresh'
-        )
-        try:
-            stdin, stdout, stderr = self.ssh_client.exec_command(curl_cmd, timeout=10)
-            exit_status = stdout.channel.recv_exit_status()
-            if exit_status == 0:
-                print("✓ Browser refresh triggered via Browser Mod")
-            else:
-                print("⚠ Browser Mod refresh skipped (not installed or unavailable)")
-        except Exception:
-            pass
+            f' http://localhost:8123/api/services/{service}'
+            for service in services
+        ]
+        script = f'code=$(curl {transfers[0]}); status=$?; echo "$code"'
+        if len(transfers) > 1:
+            script += f'; [ "$code" = 200 ] || exit $status; exec curl {" --next ".join(transfers[1:])}'
+        else:
+            script += "; exit $status"
+        return "sh -c " + shlex.quote(script)
 
-    def backup_file(self, remote_path, label="file"):
-        """Create a backup of an existing remote file"""
-        try:
-            backup_path = f"{remote_path}.backup"
-            print(f"Creating backup of existing {label}...")
+    def _api_post(self, curl_cmd, timeout=30):
+        """
+        Run a command from _api_command() on the server.
 
-            stdin, stdout, stderr = self.ssh_client.exec_command(
-                f"test -f {remote_path} && cp {remote_path} {backup_path} || echo 'No existing file to backup'"
-            )
-            stdout.read()  # Wait for command to complete
+        Returns:
+            (exit_status, http_status_codes, stderr) tuple; a code of 0 means no response
+        """
+        exit_status, out, err = self._exec(curl_cmd, timeout=timeout)
+        codes = [int(code) for code in out.split() if code.isdigit()]
+        return exit_status, codes, err.strip()
 
-            print(f"✓ Backup created at {backup_path}")
-            return True
 
-        except Exception as e:
-            print(f"⚠ Backup warning: {e}")
-            return False
+def _staging_dashboard_content(local_file, cache_dir, st=None):
+    """
+    Return the dashboard as UTF-8 bytes with the prod theme name swapped for staging.
 
+    The result is cached in cache_dir, keyed by the source file's path, mtime
+    and size (plus the theme names), so re-deploying an unchanged dashboard
+    skips the read + replace. Pass st to reuse an existing os.stat() result.
+    """
+    st = st or os.stat(local_file)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(local_file)}:{st.st_mtime_ns}:{st.st_size}:"
+        f"{HomeAssistantDeployer.PROD_THEME_NAME}:{HomeAssistantDeployer.STAGING_THEME_NAME}".encode()
+    ).hexdigest()[:16]
+    cache_path = Path(cache_dir) / f"staging-dashboard.{key}.yaml"
+    try:
+        return cache_path.read_bytes()
+    except FileNotFoundError:
+        pass
 
-def main():
+    # UTF-8 bytes can be replaced directly, no decode/encode needed
+    content = Path(local_file).read_bytes().replace(
+        HomeAssistantDeployer.PROD_THEME_NAME_B,
+        HomeAssistantDeployer.STAGING_THEME_NAME_B
+    )
+
+    # Best-effort: a read-only checkout just means no caching
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        for stale in cache_path.parent.glob("staging-dashboard.*.yaml"):
+            stale.unlink()
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return content
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command-line parser (once per process, for repeated main() calls)"""
     # Resolve paths relative to script location (repo root)
-    script_dir = Path(__file__).resolve().parent
-    repo_root = script_dir.parent
+    repo_root = Path(__file__).resolve().parent.parent
     default_local = str(repo_root / "my-dashboard.yaml")
     default_theme_local = str(repo_root / "themes" / "my_dashboard_theme.yaml")
 
@@ -282,7 +933,8 @@ Examples:
 
     parser.add_argument('--host', required=True, help='Home Assistant server hostname or IP')
     parser.add_argument('--user', required=True, help='SSH username')
-    parser.add_argument('--key', help='Path to SSH private key file (RSA, Ed25519, ECDSA)')
+    parser.add_argument('--key', help='Path to SSH private key file (RSA, Ed25519, ECDSA); '
+                        'without --key or --password, ssh-agent and then ~/.ssh/id_* are tried')
     parser.add_argument('--password', help='SSH password (alternative to key)')
     parser.add_argument('--port', type=int, default=22, help='SSH port (default: 22)')
     parser.add_argument('--local', default=default_local,
@@ -309,13 +961,30 @@ Examples:
                        help='Skip automatic YAML config reload')
     parser.add_argument('--no-backup', action='store_true',
                        help='Skip backup of existing files')
+    parser.add_argument('--force', action='store_true',
+                       help='Upload even if the remote file is already identical')
+    parser.add_argument('--no-pool', action='store_true',
+                       help='Open a dedicated SSH connection instead of reusing a pooled one')
+    parser.add_argument('--no-compress', action='store_true',
+                       help='Disable SSH transport compression (saves CPU on fast links)')
+    parser.add_argument('--sftp-window', type=int, default=4, metavar='MIB',
+                       help='SFTP channel window in MiB, with larger write requests (default: 4; 0 = paramiko defaults)')
+    parser.add_argument('--tcp-buffer', type=int, default=0, metavar='MIB',
+                       help='TCP send/receive buffer in MiB for high-latency links (default: 0 = kernel autotuning)')
+    parser.add_argument('--no-scp', action='store_true',
+                       help='Always upload over SFTP, even when a system scp binary is available')
+    parser.add_argument('--insecure', action='store_true',
+                       help='Accept an unknown server host key instead of requiring it in ~/.ssh/known_hosts')
+    return parser
 
-    args = parser.parse_args()
 
-    # Validate authentication method
+def main():
+    script_dir = Path(__file__).resolve().parent
+    args = _build_parser().parse_args()
+
+    # Authentication method
     if not args.key and not args.password:
-        print("Error: Must specify either --key or --password for authentication")
-        sys.exit(1)
+        print("No --key or --password given, trying ssh-agent and default SSH keys")
 
     # Set default remote paths
     if not args.remote:
@@ -326,14 +995,20 @@ Examples:
         theme_filename = os.path.basename(args.theme_local)
         args.theme_remote = f"{config_dir}/themes/{theme_filename}"
 
-    # Validate local files
-    if not os.path.exists(args.local):
+    # Validate local files (one stat each; the results are reused below)
+    try:
+        local_stat = os.stat(args.local)
+    except FileNotFoundError:
         print(f"Error: Local dashboard file not found: {args.local}")
         sys.exit(1)
 
-    if (args.theme or args.promote) and not os.path.exists(args.theme_local):
-        print(f"Error: Local theme file not found: {args.theme_local}")
-        sys.exit(1)
+    theme_stat = None
+    if args.theme or args.promote or args.stage:
+        try:
+            theme_stat = os.stat(args.theme_local)
+        except FileNotFoundError:
+            print(f"Error: Local theme file not found: {args.theme_local}")
+            sys.exit(1)
 
     # Deploy
     deployer = HomeAssistantDeployer(
@@ -342,14 +1017,22 @@ Examples:
         key_file=args.key,
         password=args.password,
         port=args.port,
-        token=args.token
+        token=args.token,
+        use_pool=not args.no_pool,
+        compress=not args.no_compress,
+        skip_unchanged=not args.force,
+        sftp_window=args.sftp_window * 1024 * 1024,
+        tcp_buffer=args.tcp_buffer * 1024 * 1024,
+        use_scp=not args.no_scp,
+        insecure=args.insecure
     )
 
     if not deployer.connect():
         sys.exit(1)
 
     try:
-        deployed = []
+        # Uploaded concurrently by deploy_all()
+        uploads = []
 
         if args.stage:
             # ── Staging deployment ──
@@ -366,58 +1049,36 @@ Examples:
             theme_stem, theme_ext = os.path.splitext(theme_name)
             staging_theme_remote = f"{theme_dir}/{theme_stem}-staging{theme_ext}"
 
-            # Dashboard: replace theme name in-memory
-            dashboard_content = Path(args.local).read_text(encoding="utf-8")
-            dashboard_content = dashboard_content.replace(
-                HomeAssistantDeployer.PROD_THEME_NAME,
-                HomeAssistantDeployer.STAGING_THEME_NAME
-            )
-
-            if not args.no_backup:
-                deployer.backup_file(staging_dashboard_remote, "staging dashboard")
-
-            if not deployer.deploy_content(dashboard_content, staging_dashboard_remote, "staging dashboard"):
-                print("\n✗ Staging dashboard deployment failed")
-                sys.exit(1)
-            deployed.append("staging dashboard")
+            # Dashboard: replace theme name in-memory (cached across runs)
+            dashboard_content = _staging_dashboard_content(args.local, script_dir / ".cache", local_stat)
+            uploads.append(Upload("staging dashboard", staging_dashboard_remote, None,
+                                  dashboard_content, len(dashboard_content)))
 
             # Theme: replace top-level key in-memory (no second file needed)
-            print()
-            theme_content = Path(args.theme_local).read_text(encoding="utf-8")
-            theme_content = theme_content.replace(
-                HomeAssistantDeployer.PROD_THEME_NAME + ":",
-                HomeAssistantDeployer.STAGING_THEME_NAME + ":",
+            theme_content = Path(args.theme_local).read_bytes().replace(
+                HomeAssistantDeployer.PROD_THEME_NAME_B + b":",
+                HomeAssistantDeployer.STAGING_THEME_NAME_B + b":",
                 1
             )
-
-            if not args.no_backup:
-                deployer.backup_file(staging_theme_remote, "staging theme")
-
-            if not deployer.deploy_content(theme_content, staging_theme_remote, "staging theme"):
-                print("\n✗ Staging theme deployment failed")
-                sys.exit(1)
-            deployed.append("staging theme")
+            uploads.append(Upload("staging theme", staging_theme_remote, None,
+                                  theme_content, len(theme_content)))
 
         else:
             # ── Production deployment (default or --promote) ──
-            if not args.no_backup:
-                deployer.backup_file(args.remote, "dashboard")
-
-            if not deployer.deploy_file(args.local, args.remote, "dashboard"):
-                print("\n✗ Dashboard deployment failed")
-                sys.exit(1)
-            deployed.append("dashboard")
+            uploads.append(Upload("dashboard", args.remote, args.local, None, local_stat.st_size))
 
             # Deploy theme if --theme or --promote
             if args.theme or args.promote:
-                print()
-                if not args.no_backup:
-                    deployer.backup_file(args.theme_remote, "theme")
-
-                if not deployer.deploy_file(args.theme_local, args.theme_remote, "theme"):
-                    print("\n✗ Theme deployment failed")
-                    sys.exit(1)
-                deployed.append("theme")
+                uploads.append(Upload("theme", args.theme_remote, args.theme_local, None,
+                                      theme_stat.st_size))
+
+        deployed, failed = deployer.deploy_all(uploads, backup=not args.no_backup)
+        if failed:
+            print(f"\n✗ Deployment failed: {', '.join(failed)}")
+            sys.exit(1)
+        if not deployed:
+            print("\n✓ Nothing to deploy: remote files are already up to date (use --force to re-upload)")
+            return
 
         # ── Summary ──
         if args.stage:
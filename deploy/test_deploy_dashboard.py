@@ -0,0 +1,233 @@
+"""
+Tests for deploy_dashboard.py against an in-process paramiko SFTP server.
+
+Run with: python -m unittest discover deploy
+"""
+
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import unittest
+
+import paramiko
+
+from deploy_dashboard import HomeAssistantDeployer, Upload
+
+
+class _Server(paramiko.ServerInterface):
+    """Accepts anyone; exec requests run in a local shell unless shell is False"""
+
+    shell = True
+
+    def check_auth_none(self, username):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "none"
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel, command):
+        if not self.shell:
+            return False
+
+        def run():
+            result = subprocess.run(command.decode(), shell=True, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+            channel.sendall(result.stdout)
+            channel.sendall_stderr(result.stderr)
+            channel.send_exit_status(result.returncode)
+            channel.close()
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+
+class _Handle(paramiko.SFTPHandle):
+    """File handle whose WRITEs fail once they reach fail_after bytes, until fail_until"""
+
+    fail_after = None
+    fail_until = None
+
+    def write(self, offset, data):
+        if (self.fail_after is not None and offset + len(data) > self.fail_after
+                and (self.fail_until is None or offset < self.fail_until)):
+            return paramiko.SFTP_FAILURE
+        return super().write(offset, data)
+
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.writefile.fileno()))
+
+
+class _SFTPInterface(paramiko.SFTPServerInterface):
+    """Plain local-filesystem SFTP server; paths are used as-is"""
+
+    fail_after = None
+    fail_until = None
+
+    def open(self, path, flags, attr):
+        fd = os.open(path, flags, 0o644)
+        handle = _Handle(flags)
+        handle.fail_after = type(self).fail_after
+        handle.fail_until = type(self).fail_until
+        handle.readfile = handle.writefile = os.fdopen(fd, "r+b" if flags & os.O_RDWR else
+                                                       "wb" if flags & os.O_WRONLY else "rb")
+        return handle
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def posix_rename(self, oldpath, newpath):
+        try:
+            os.replace(oldpath, newpath)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+
+class SFTPWriteTest(unittest.TestCase):
+    """Uploads over SFTP, including a server that fails WRITE requests"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.host_key = paramiko.RSAKey.generate(2048)
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.remote_path = os.path.join(self.dir.name, "my-dashboard.yaml")
+        with open(self.remote_path, "wb") as f:
+            f.write(b"live dashboard\n")
+
+        client_sock, server_sock = socket.socketpair()
+        self.server = paramiko.Transport(server_sock)
+        self.server.add_server_key(self.host_key)
+        self.server.set_subsystem_handler("sftp", paramiko.SFTPServer, _SFTPInterface)
+        threading.Thread(target=self.server.start_server, kwargs={"server": _Server()},
+                         daemon=True).start()
+        self.client = paramiko.Transport(client_sock)
+        self.client.connect()
+        self.client.auth_none("test")
+
+        self.deployer = HomeAssistantDeployer("localhost", "test", use_scp=False)
+        self.deployer.transport = self.client
+        self.deployer.sftp_client = self.deployer._open_sftp()
+
+    def tearDown(self):
+        _SFTPInterface.fail_after = _SFTPInterface.fail_until = None
+        _Server.shell = True
+        self.deployer.sftp_client.close()
+        self.client.close()
+        self.server.close()
+        self.dir.cleanup()
+
+    def _read_remote(self, path=None):
+        with open(path or self.remote_path, "rb") as f:
+            return f.read()
+
+    def test_upload_replaces_file_and_keeps_backup(self):
+        content = b"new dashboard\n" * 1000
+        self.assertTrue(self.deployer.deploy_content(content, self.remote_path, backup=True))
+        self.assertEqual(self._read_remote(), content)
+        self.assertEqual(self._read_remote(self.remote_path + ".backup"), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_failed_first_write_keeps_live_file(self):
+        _SFTPInterface.fail_after = 0
+        self.assertFalse(self.deployer.deploy_content(b"x" * 4096, self.remote_path, backup=True))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".backup"))
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_failed_later_write_keeps_live_file(self):
+        _SFTPInterface.fail_after = 256 * 1024
+        self.assertFalse(self.deployer.deploy_content(b"x" * (2 * 1024 * 1024), self.remote_path,
+                                                      backup=True))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".backup"))
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_failed_middle_write_keeps_live_file(self):
+        # Later WRITEs succeed, so the file has its full length with a hole
+        _SFTPInterface.fail_after, _SFTPInterface.fail_until = 512 * 1024, 1024 * 1024
+        self.assertFalse(self.deployer.deploy_content(b"x" * (2 * 1024 * 1024), self.remote_path,
+                                                      backup=True))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".backup"))
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_parallel_upload_writes_every_range(self):
+        self.deployer.PARALLEL_UPLOAD_MIN = 1024 * 1024
+        content = bytes(range(256)) * (16 * 1024)  # 4 MiB: 1 MiB per stream
+        self.assertTrue(self.deployer.deploy_content(content, self.remote_path, backup=True))
+        self.assertEqual(self._read_remote(), content)
+        self.assertEqual(self._read_remote(self.remote_path + ".backup"), b"live dashboard\n")
+
+    def test_failed_parallel_range_keeps_live_file(self):
+        # The last range still extends the file to its full length
+        self.deployer.PARALLEL_UPLOAD_MIN = 1024 * 1024
+        _SFTPInterface.fail_after, _SFTPInterface.fail_until = 1024 * 1024, 2 * 1024 * 1024
+        self.assertFalse(self.deployer.deploy_content(b"x" * (4 * 1024 * 1024), self.remote_path,
+                                                      backup=True))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".backup"))
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_failed_write_without_shell_keeps_live_file(self):
+        # No sha256sum to run, so the size check has to catch the short file
+        _Server.shell = False
+        _SFTPInterface.fail_after = 256 * 1024
+        self.assertFalse(self.deployer.deploy_content(b"x" * (2 * 1024 * 1024), self.remote_path,
+                                                      backup=True))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_short_scp_upload_keeps_live_file(self):
+        local_file = os.path.join(self.dir.name, "local.yaml")
+        with open(local_file, "wb") as f:
+            f.write(b"new dashboard\n" * 1000)
+
+        def truncated_scp(local_file, tmp_path):
+            with open(tmp_path, "wb") as f:
+                f.write(b"new dash")
+            return True
+
+        self.deployer._fast_upload = truncated_scp
+        self.assertFalse(self.deployer.deploy_file(local_file, self.remote_path, backup=True))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+        self.assertFalse(os.path.exists(self.remote_path + ".backup"))
+        self.assertFalse(os.path.exists(self.remote_path + ".tmp"))
+
+    def test_unreadable_local_file_is_reported_as_failed(self):
+        upload = Upload("dashboard", self.remote_path, self.dir.name, None, None)
+        self.assertEqual(self.deployer.deploy_all([upload]), ([], ["dashboard"]))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+
+    def test_refused_sftp_channel_fails_every_upload(self):
+        def refused():
+            raise paramiko.ChannelException(paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED,
+                                            "open failed")
+
+        self.deployer._open_sftp = refused
+        uploads = [Upload(label, self.remote_path + suffix, None, b"new dashboard\n", None)
+                   for label, suffix in (("dashboard", ""), ("theme", ".theme"))]
+        self.assertEqual(self.deployer.deploy_all(uploads), ([], ["dashboard", "theme"]))
+        self.assertEqual(self._read_remote(), b"live dashboard\n")
+
+
+if __name__ == "__main__":
+    unittest.main()